@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 import argparse
+import asyncio
+
 from todo_agent.config import Settings
 from todo_agent.models import SessionState, TaskStatus
 from todo_agent.planner import propose_todo_list, edit_tasks_interactively
-from todo_agent.executor import run_execution_loop, save_session_to_file
+from todo_agent.executor import run_execution_loop_async, save_session_to_file
 
 
 def ask_goal_from_user() -> str:
@@ -117,9 +119,9 @@ def main():
             print(f"[{task.id}] {task.title}")
             print(f"    {task.description}\n")
 
-    # 5. Execution loop
+    # 5. Execution loop (pending tasks run concurrently)
     print("\n=== Starting execution loop ===")
-    run_execution_loop(state)
+    asyncio.run(run_execution_loop_async(state))
 
     # 6. Final summary
     print("\n=== Final Task Statuses ===")
@@ -1,5 +1,7 @@
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,3 +24,15 @@ class Settings:
                 "OPENAI_API_KEY is not set. Export it in your environment "
                 "before running the agent."
             )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance.
+
+    Settings only reads environment variables, so building it once is
+    enough; callers that need a different model should derive a copy with
+    dataclasses.replace rather than constructing a new Settings.
+    """
+    return Settings()
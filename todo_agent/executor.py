@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-import json
+import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple
+
+import jsonriver
+import orjson
 
 from .models import SessionState, Task, TaskStatus
-from .openai_client import chat_completion_json
+from .openai_client import chat_completion_json, chat_completion_json_stream_async
 
 
 EXECUTOR_SYSTEM_PROMPT = """
@@ -35,46 +38,118 @@ Respond ONLY with valid JSON of the following shape:
 Do NOT include any additional keys. Do NOT include extra commentary outside JSON.
 """
 
+# Constant-time string -> TaskStatus mapping (TaskStatus(...) does a
+# linear scan).
+_STATUS_FROM_STR = {s.value: s for s in TaskStatus}
 
-def execute_single_task(state: SessionState, task: Task) -> Tuple[str, TaskStatus, str]:
-    """
-    Calls the LLM to 'execute' the task, and returns (result, status, reflection).
-    """
-    messages = [
-        {"role": "system", "content": EXECUTOR_SYSTEM_PROMPT},
+# Strict schema for the executor response: the server validates shape and
+# the status enum, so parsing needs no defensive coercion or fallbacks.
+_EXECUTOR_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "task_result",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "result": {"type": "string"},
+                "status": {
+                    "type": "string",
+                    "enum": ["done", "failed", "needs-follow-up"],
+                },
+                "reflection": {"type": "string"},
+            },
+            "required": ["result", "status", "reflection"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# The system message never changes; share one dict across calls (the
+# OpenAI client only reads it).
+_EXECUTOR_SYSTEM_MSG = {"role": "system", "content": EXECUTOR_SYSTEM_PROMPT}
+
+
+def _build_executor_messages(state: SessionState, task: Task) -> List[dict]:
+    # System and goal messages are identical for every task in a session,
+    # so they form a stable prefix the API's prompt cache can reuse; only
+    # the final message varies per task.
+    return [
+        _EXECUTOR_SYSTEM_MSG,
+        state.goal_message(),
         {
             "role": "user",
-            "content": json.dumps(
+            "content": orjson.dumps(
                 {
-                    "goal": state.goal,
                     "task": {
                         "id": task.id,
                         "title": task.title,
                         "description": task.description,
                     },
                 },
-                ensure_ascii=False,
-                indent=2,
-            ),
+                option=orjson.OPT_INDENT_2,
+            ).decode(),
         },
     ]
 
+
+def _parse_executor_response(raw: str) -> Tuple[str, TaskStatus, str]:
+    # The strict response schema guarantees all three keys exist and that
+    # status is one of the enum values.
+    data = orjson.loads(raw)
+    return (
+        data["result"].strip(),
+        _STATUS_FROM_STR[data["status"]],
+        data["reflection"].strip(),
+    )
+
+
+def execute_single_task(state: SessionState, task: Task) -> Tuple[str, TaskStatus, str]:
+    """
+    Calls the LLM to 'execute' the task, and returns (result, status, reflection).
+    """
     raw = chat_completion_json(
         state.settings,
-        messages,
-        response_format={"type": "json_object"},
+        _build_executor_messages(state, task),
+        response_format=_EXECUTOR_RESPONSE_FORMAT,
     )
-    data = json.loads(raw)
+    return _parse_executor_response(raw)
+
 
-    result = str(data.get("result", "")).strip()
-    status_str = str(data.get("status", "done")).strip().lower()
-    reflection = str(data.get("reflection", "")).strip()
+async def _execute_single_task_async(state: SessionState, task: Task) -> Tuple[str, TaskStatus, str]:
+    """
+    Async mirror of execute_single_task, for concurrent execution.
+
+    The completion is streamed through an incremental JSON parser so the
+    task's status can be logged as soon as the model has emitted it,
+    instead of after the (often long) result text finishes. The full
+    accumulated text is still parsed at the end as a sanity check.
+    """
+    chunks = []
 
-    if status_str not in {"done", "failed", "needs-follow-up"}:
-        status_str = "needs-follow-up"
+    async def _deltas():
+        stream = chat_completion_json_stream_async(
+            state.settings,
+            _build_executor_messages(state, task),
+            response_format=_EXECUTOR_RESPONSE_FORMAT,
+        )
+        async for delta in stream:
+            chunks.append(delta)
+            yield delta
 
-    status = TaskStatus(status_str)
-    return result, status, reflection
+    status_logged = False
+    async for value in jsonriver.parse(_deltas()):
+        # "status" is final once the parser has moved on to "reflection".
+        if (
+            not status_logged
+            and isinstance(value, dict)
+            and "status" in value
+            and "reflection" in value
+        ):
+            state.log(f"[Agent] Task #{task.id} status (streamed): {value['status']}")
+            status_logged = True
+
+    return _parse_executor_response("".join(chunks))
 
 
 def run_execution_step(state: SessionState) -> bool:
@@ -85,12 +160,12 @@ def run_execution_step(state: SessionState) -> bool:
         True  if there are still pending tasks after this step,
         False if no pending tasks remain.
     """
-    pending = [t for t in state.tasks if t.status == TaskStatus.PENDING]
-    if not pending:
+    queue = state.pending_queue()
+    if not queue:
         state.log("No pending tasks. Execution step did nothing.")
         return False
 
-    task = pending[0]
+    task = queue[0]
     state.log(f"\n[Agent] Selected task #{task.id}: {task.title}")
     state.log(f"[Agent] Description: {task.description}")
 
@@ -99,17 +174,19 @@ def run_execution_step(state: SessionState) -> bool:
         task.result = result
         task.status = status
         task.reflection = reflection
+        state.mark_task_dirty(task)
 
         state.log(f"[Agent] Result status for task #{task.id}: {task.status}")
         state.log(f"[Agent] Reflection: {task.reflection}")
     except Exception as exc:
         task.status = TaskStatus.FAILED
         task.reflection = f"Execution failed with error: {exc}"
+        state.mark_task_dirty(task)
         state.log(f"[Agent] ERROR executing task #{task.id}: {exc}")
         state.log("[Agent] Marking task as FAILED.")
 
     # Are there any pending tasks left?
-    return any(t.status == TaskStatus.PENDING for t in state.tasks)
+    return bool(state.pending_queue())
 
 
 def run_execution_loop(state: SessionState) -> None:
@@ -121,6 +198,51 @@ def run_execution_loop(state: SessionState) -> None:
     state.log("All tasks are in a terminal state. Execution loop finished.")
 
 
+async def run_execution_loop_async(state: SessionState, concurrency: int = 8) -> None:
+    """
+    Execute all pending tasks concurrently.
+
+    Tasks carry no dependency information, so they are independent and the
+    wall-clock cost of a session is dominated by one LLM round-trip instead
+    of one per task. Concurrency is bounded by a semaphore.
+    """
+    pending = list(state.pending_queue())
+    if not pending:
+        state.log("No pending tasks. Execution loop did nothing.")
+        return
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(task: Task):
+        async with semaphore:
+            state.log(f"\n[Agent] Executing task #{task.id}: {task.title}")
+            return await _execute_single_task_async(state, task)
+
+    outcomes = await asyncio.gather(
+        *(run_one(task) for task in pending),
+        return_exceptions=True,
+    )
+
+    for task, outcome in zip(pending, outcomes):
+        if isinstance(outcome, BaseException):
+            task.status = TaskStatus.FAILED
+            task.reflection = f"Execution failed with error: {outcome}"
+            state.mark_task_dirty(task)
+            state.log(f"[Agent] ERROR executing task #{task.id}: {outcome}")
+            state.log("[Agent] Marking task as FAILED.")
+            continue
+
+        result, status, reflection = outcome
+        task.result = result
+        task.status = status
+        task.reflection = reflection
+        state.mark_task_dirty(task)
+        state.log(f"[Agent] Result status for task #{task.id}: {task.status}")
+        state.log(f"[Agent] Reflection: {task.reflection}")
+
+    state.log("All tasks are in a terminal state. Execution loop finished.")
+
+
 def save_session_to_file(state: SessionState, path: str | None = None) -> str:
     """
     (CLI-only convenience) Persist the session in a standalone JSON file.
@@ -130,8 +252,5 @@ def save_session_to_file(state: SessionState, path: str | None = None) -> str:
         path = f"session-{timestamp}.json"
 
     out_path = Path(path).resolve()
-    out_path.write_text(
-        json.dumps(state.to_dict(), ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    out_path.write_bytes(orjson.dumps(state.to_dict(), option=orjson.OPT_INDENT_2))
     return str(out_path)
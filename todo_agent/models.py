@@ -1,11 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+import logging
+import sys
+from collections import deque
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import Deque, Iterable, Iterator, List, Optional, Dict, Any, Set, Union
 
 from .config import Settings
 
+# Session log lines kept in memory; older lines are dropped (the event log
+# on disk retains the full history between snapshots).
+MAX_LOG_LINES = 1000
+
+logger = logging.getLogger("todo_agent")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
 
 class TaskStatus(str, Enum):
     PENDING = "pending"
@@ -14,7 +29,7 @@ class TaskStatus(str, Enum):
     NEEDS_FOLLOW_UP = "needs-follow-up"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: int
     title: str
@@ -23,29 +38,281 @@ class Task:
     result: Optional[str] = None
     reflection: Optional[str] = None
 
+    def __post_init__(self):
+        # Short titles recur across regenerations, reloads, and saves;
+        # interning shares one string object per distinct title.
+        self.title = sys.intern(self.title)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # hand-rolled rather than dataclasses.asdict, which recurses and
+        # deep-copies every field
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "status": self.status.value,
+            "result": self.result,
+            "reflection": self.reflection,
+        }
+
+
+# Status codes for TaskTable's compact bytearray column. PENDING must be 0
+# so "any task still pending?" is a plain `0 in statuses` byte scan.
+_STATUS_BY_CODE = (
+    TaskStatus.PENDING,
+    TaskStatus.DONE,
+    TaskStatus.FAILED,
+    TaskStatus.NEEDS_FOLLOW_UP,
+)
+_STATUS_TO_CODE = {status: code for code, status in enumerate(_STATUS_BY_CODE)}
+
+
+class TaskView:
+    """
+    Mutable view of one row of a TaskTable.
+
+    Exposes the same attributes as Task, so call sites can keep reading
+    and writing task.status / task.result / etc.; writes go straight into
+    the table's columns.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: TaskTable, index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._index]
+
+    @property
+    def title(self) -> str:
+        return self._table.titles[self._index]
+
+    @title.setter
+    def title(self, value: str) -> None:
+        self._table.titles[self._index] = value
+
+    @property
+    def description(self) -> str:
+        return self._table.descriptions[self._index]
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._table.descriptions[self._index] = value
+
+    @property
+    def status(self) -> TaskStatus:
+        return _STATUS_BY_CODE[self._table.statuses[self._index]]
+
+    @status.setter
+    def status(self, value: TaskStatus) -> None:
+        self._table.statuses[self._index] = _STATUS_TO_CODE[value]
+
+    @property
+    def result(self) -> Optional[str]:
+        return self._table.results[self._index]
+
+    @result.setter
+    def result(self, value: Optional[str]) -> None:
+        self._table.results[self._index] = value
+
+    @property
+    def reflection(self) -> Optional[str]:
+        return self._table.reflections[self._index]
+
+    @reflection.setter
+    def reflection(self, value: Optional[str]) -> None:
+        self._table.reflections[self._index] = value
+
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        data["status"] = self.status.value
-        return data
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "status": self.status.value,
+            "result": self.result,
+            "reflection": self.reflection,
+        }
+
 
+class TaskTable:
+    """
+    Column-oriented (structure-of-arrays) storage for a session's tasks.
 
-@dataclass
+    Hot operations only touch the column they need: the pending check
+    scans a bytearray of one byte per task at C speed, and serialization
+    zips columns instead of walking dataclass instances. Rows are handed
+    out as TaskView objects for attribute-style access.
+    """
+
+    __slots__ = ("ids", "titles", "descriptions", "statuses", "results", "reflections")
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self.ids: List[int] = []
+        self.titles: List[str] = []
+        self.descriptions: List[str] = []
+        self.statuses = bytearray()
+        self.results: List[Optional[str]] = []
+        self.reflections: List[Optional[str]] = []
+        for task in tasks:
+            self.append(task)
+
+    def append(self, task: Task) -> None:
+        self.ids.append(task.id)
+        self.titles.append(task.title)
+        self.descriptions.append(task.description)
+        self.statuses.append(_STATUS_TO_CODE[task.status])
+        self.results.append(task.result)
+        self.reflections.append(task.reflection)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __bool__(self) -> bool:
+        return bool(self.ids)
+
+    def __getitem__(self, index: int) -> TaskView:
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("task index out of range")
+        return TaskView(self, index)
+
+    def __iter__(self) -> Iterator[TaskView]:
+        for index in range(len(self.ids)):
+            yield TaskView(self, index)
+
+    def has_pending(self) -> bool:
+        return 0 in self.statuses
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": task_id,
+                "title": title,
+                "description": description,
+                "status": _STATUS_BY_CODE[code].value,
+                "result": result,
+                "reflection": reflection,
+            }
+            for task_id, title, description, code, result, reflection in zip(
+                self.ids,
+                self.titles,
+                self.descriptions,
+                self.statuses,
+                self.results,
+                self.reflections,
+            )
+        ]
+
+
+@dataclass(slots=True)
 class SessionState:
     goal: str
     mode: str  # "confirm" or "auto"
     settings: Settings
-    tasks: List[Task] = field(default_factory=list)
-    logs: List[str] = field(default_factory=list)
+    logs: Deque[str] = field(default_factory=lambda: deque(maxlen=MAX_LOG_LINES))
+
+    # Total lines ever logged (logs itself is bounded and drops old lines).
+    logs_total: int = field(default=0, init=False, repr=False)
+
+    # Columnar task storage; assign a list of Task to the `tasks` property
+    # and it is converted (see below).
+    _table: TaskTable = field(default_factory=TaskTable, init=False, repr=False)
+
+    # Persistence bookkeeping (maintained by storage): which tasks changed
+    # since the last save, how many log lines are already on disk, and how
+    # many events were appended since the last snapshot.
+    dirty_task_ids: Set[int] = field(default_factory=set, init=False, repr=False)
+    logs_persisted: int = field(default=0, init=False, repr=False)
+    events_since_snapshot: int = field(default=0, init=False, repr=False)
+
+    # Descriptions as last persisted, so event writes can omit the (long)
+    # description when it has not changed since the snapshot/load.
+    saved_descriptions: Dict[int, str] = field(default_factory=dict, init=False, repr=False)
+
+    # Lazily built queue of tasks awaiting execution (see pending_queue).
+    _pending_queue: Optional[Deque[TaskView]] = field(default=None, init=False, repr=False)
+    _pending_source: Optional[TaskTable] = field(default=None, init=False, repr=False)
+
+    # Cached goal message shared by all executor calls (see goal_message).
+    _goal_message: Optional[Dict[str, str]] = field(default=None, init=False, repr=False)
+
+    @property
+    def tasks(self) -> TaskTable:
+        return self._table
+
+    @tasks.setter
+    def tasks(self, value: Union[TaskTable, Iterable[Task]]) -> None:
+        self._table = value if isinstance(value, TaskTable) else TaskTable(value)
 
     def log(self, message: str) -> None:
-        print(message)
+        logger.info(message)
         self.logs.append(message)
+        self.logs_total += 1
+
+    def extend_logs(self, lines: Iterable[str]) -> None:
+        """Append already-persisted log lines (used when loading from disk)."""
+        for line in lines:
+            self.logs.append(line)
+            self.logs_total += 1
+
+    def unpersisted_logs(self) -> List[str]:
+        """
+        Log lines appended since the last save. Lines that were both
+        appended and dropped from the bounded buffer in between are gone.
+        """
+        new = self.logs_total - self.logs_persisted
+        if new <= 0:
+            return []
+        new = min(new, len(self.logs))
+        return list(self.logs)[len(self.logs) - new:]
+
+    def mark_task_dirty(self, task: Union[Task, TaskView]) -> None:
+        self.dirty_task_ids.add(task.id)
+
+    def goal_message(self) -> Dict[str, str]:
+        """
+        The session goal as a standalone user message, built once.
+
+        Every executor call for this session sends byte-identical
+        system + goal messages, so the API's server-side prompt cache can
+        reuse the shared prefix instead of re-prefilling it per task.
+        """
+        if self._goal_message is None:
+            self._goal_message = {
+                "role": "user",
+                "content": f"PROJECT GOAL:\n{self.goal}",
+            }
+        return self._goal_message
+
+    def pending_queue(self) -> Deque[TaskView]:
+        """
+        Queue of tasks still awaiting execution.
+
+        Built once per task table and drained from the front as tasks reach
+        a terminal state, so selecting the next task is O(1) instead of
+        rescanning all tasks on every step. Rebuilt automatically when the
+        task table is replaced (e.g. after regenerating the plan).
+        """
+        if self._pending_queue is None or self._pending_source is not self._table:
+            self._pending_queue = deque(
+                t for t in self._table if t.status is TaskStatus.PENDING
+            )
+            self._pending_source = self._table
+
+        queue = self._pending_queue
+        while queue and queue[0].status is not TaskStatus.PENDING:
+            queue.popleft()
+        return queue
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "goal": self.goal,
             "mode": self.mode,
             "settings": {"model": self.settings.model},
-            "tasks": [t.to_dict() for t in self.tasks],
-            "logs": self.logs,
+            "tasks": self._table.to_dicts(),
+            "logs": list(self.logs),
         }
@@ -1,21 +1,53 @@
 from __future__ import annotations
 
-from openai import OpenAI
+import functools
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
 from .config import Settings
 
+# Connection tuning shared by both clients: HTTP/2 multiplexes concurrent
+# task requests over one TLS connection, and generous keep-alive limits
+# let the gather-based executor fan out without extra handshakes.
+_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+@functools.lru_cache(maxsize=4)
+def get_client(api_key: str) -> OpenAI:
+    """
+    Returns an OpenAI client for the given API key.
+
+    Cached so every call reuses the same httpx connection pool instead of
+    paying a fresh TCP+TLS handshake per request. Keyed on the api_key
+    string (not Settings) so per-request model overrides share a client.
+    """
+    # http2/limits must be set on the transport: httpx ignores the
+    # Client-level arguments when an explicit transport is passed.
+    http_client = httpx.Client(
+        transport=httpx.HTTPTransport(retries=2, http2=True, limits=_LIMITS),
+        timeout=_TIMEOUT,
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
 
-def get_client(settings: Settings) -> OpenAI:
+@functools.lru_cache(maxsize=4)
+def get_async_client(api_key: str) -> AsyncOpenAI:
     """
-    Returns an OpenAI client configured with the user's API key.
+    Async counterpart of get_client, for concurrent task execution.
     """
-    return OpenAI(api_key=settings.api_key)
+    http_client = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(retries=2, http2=True, limits=_LIMITS),
+        timeout=_TIMEOUT,
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client)
 
 
 def chat_completion_json(settings: Settings, messages, response_format=None):
     """
     Small helper to call chat.completions.create and return the text content.
     """
-    client = get_client(settings)
+    client = get_client(settings.api_key)
 
     kwargs = {}
     if response_format is not None:
@@ -30,3 +62,27 @@ def chat_completion_json(settings: Settings, messages, response_format=None):
     # We expect a single choice, single message
     content = response.choices[0].message.content
     return content
+
+
+async def chat_completion_json_stream_async(settings: Settings, messages, response_format=None):
+    """
+    Streaming variant: yields content deltas as they arrive instead of
+    waiting for the full completion. Callers can feed the deltas into an
+    incremental JSON parser to act on partial output.
+    """
+    client = get_async_client(settings.api_key)
+
+    kwargs = {}
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+
+    stream = await client.chat.completions.create(
+        model=settings.model,
+        messages=messages,
+        stream=True,
+        **kwargs,
+    )
+
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
@@ -0,0 +1,115 @@
+# todo_agent/plan_cache.py
+from __future__ import annotations
+
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .config import Settings
+from .openai_client import get_client
+from .storage import DATA_DIR
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def normalize_goal(goal: str) -> str:
+    """
+    Canonicalize a goal string so trivially different phrasings
+    (case, extra whitespace) share one cache key.
+    """
+    return re.sub(r"\s+", " ", goal.strip().lower())
+
+
+def embed_goal(goal_norm: str, settings: Settings) -> np.ndarray:
+    """
+    Fetch an embedding vector for a normalized goal (one small API call,
+    much cheaper than a full planning completion).
+    """
+    client = get_client(settings.api_key)
+    response = client.embeddings.create(model=EMBEDDING_MODEL, input=goal_norm)
+    return np.asarray(response.data[0].embedding, dtype=np.float32)
+
+
+def _l2_normalize(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return vector
+    return vector / norm
+
+
+class PlanCache:
+    """
+    SQLite-backed cache of previously generated plans.
+
+    Rows are (goal_norm, embedding_blob, tasks_json, created_at). Lookup is
+    two-tier: exact match on the normalized goal first, then cosine
+    similarity against stored embeddings. A hit returns the raw planner
+    JSON so it can go through the normal parsing path.
+    """
+
+    SIMILARITY_THRESHOLD = 0.93
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or (DATA_DIR / "plan_cache.sqlite3")
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plans ("
+            "  goal_norm TEXT PRIMARY KEY,"
+            "  embedding BLOB,"
+            "  tasks_json TEXT NOT NULL,"
+            "  created_at TEXT NOT NULL"
+            ")"
+        )
+        self._conn.commit()
+
+    def get_exact(self, goal_norm: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT tasks_json FROM plans WHERE goal_norm = ?", (goal_norm,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_similar(self, embedding: np.ndarray) -> Optional[str]:
+        rows = self._conn.execute(
+            "SELECT embedding, tasks_json FROM plans WHERE embedding IS NOT NULL"
+        ).fetchall()
+        if not rows:
+            return None
+
+        query = _l2_normalize(embedding.astype(np.float32))
+        best_sim = -1.0
+        best_json: Optional[str] = None
+        for blob, tasks_json in rows:
+            cached = np.frombuffer(blob, dtype=np.float32)
+            if cached.shape != query.shape:
+                continue
+            sim = float(np.dot(query, _l2_normalize(cached)))
+            if sim > best_sim:
+                best_sim = sim
+                best_json = tasks_json
+
+        if best_sim >= self.SIMILARITY_THRESHOLD:
+            return best_json
+        return None
+
+    def put(self, goal_norm: str, embedding: Optional[np.ndarray], tasks_json: str) -> None:
+        blob = embedding.astype(np.float32).tobytes() if embedding is not None else None
+        self._conn.execute(
+            "INSERT OR REPLACE INTO plans (goal_norm, embedding, tasks_json, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (goal_norm, blob, tasks_json, datetime.now().isoformat(timespec="seconds")),
+        )
+        self._conn.commit()
+
+
+_plan_cache: Optional[PlanCache] = None
+
+
+def get_plan_cache() -> PlanCache:
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = PlanCache()
+    return _plan_cache
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import json
-from typing import List
+from typing import Callable, List, Optional, Tuple
+
+import anyio
+import jsonriver
+import orjson
 
 from .config import Settings
 from .models import Task, SessionState
-from .openai_client import chat_completion_json
+from .openai_client import chat_completion_json, chat_completion_json_stream_async
+from .plan_cache import embed_goal, get_plan_cache, normalize_goal
+from .storage import find_tasks_for_goal
 
 
 PLANNER_SYSTEM_PROMPT = """
@@ -32,25 +37,56 @@ Guidelines:
 """
 
 
+# Shared across calls; the OpenAI client only reads message dicts.
+_PLANNER_SYSTEM_MSG = {"role": "system", "content": PLANNER_SYSTEM_PROMPT}
+
+# Strict schema for the planner response; the server guarantees a "tasks"
+# array whose items carry title and description.
+_PLANNER_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "todo_list",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "tasks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "title": {"type": "string"},
+                            "description": {"type": "string"},
+                        },
+                        "required": ["title", "description"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["tasks"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _task_from_raw(raw: dict, task_id: int) -> Task:
+    title = str(raw.get("title", f"Task {task_id}")).strip()
+    description = str(raw.get("description", "")).strip()
+    return Task(id=task_id, title=title, description=description)
+
+
 def _parse_tasks_from_json(json_str: str) -> List[Task]:
-    data = json.loads(json_str)
+    data = orjson.loads(json_str)
     if "tasks" not in data or not isinstance(data["tasks"], list):
         raise ValueError("Planner response JSON missing 'tasks' list")
 
-    tasks: List[Task] = []
-    for i, raw in enumerate(data["tasks"], start=1):
-        title = str(raw.get("title", f"Task {i}")).strip()
-        description = str(raw.get("description", "")).strip()
-        tasks.append(Task(id=i, title=title, description=description))
-    return tasks
+    return [_task_from_raw(raw, i) for i, raw in enumerate(data["tasks"], start=1)]
 
 
-def propose_todo_list(goal: str, settings: Settings) -> List[Task]:
-    """
-    Calls the LLM to propose a structured TODO list for the given goal.
-    """
-    messages = [
-        {"role": "system", "content": PLANNER_SYSTEM_PROMPT},
+def _build_planner_messages(goal: str) -> List[dict]:
+    return [
+        _PLANNER_SYSTEM_MSG,
         {
             "role": "user",
             "content": f"My high-level goal is:\n{goal}\n\n"
@@ -58,13 +94,135 @@ def propose_todo_list(goal: str, settings: Settings) -> List[Task]:
         },
     ]
 
+
+def _plan_from_cache(goal_norm: str, settings: Settings) -> Tuple[Optional[str], Optional[object]]:
+    """
+    Look up a cached plan for the normalized goal. Returns (cached raw JSON
+    or None, the goal embedding if one was computed). Best effort: any
+    failure is treated as a cache miss.
+    """
+    cache = get_plan_cache()
+    embedding = None
+    try:
+        cached = cache.get_exact(goal_norm)
+        if cached is None:
+            embedding = embed_goal(goal_norm, settings)
+            cached = cache.get_similar(embedding)
+        return cached, embedding
+    except Exception:
+        return None, embedding
+
+
+def _store_plan(goal_norm: str, embedding, raw: str) -> None:
+    """Write a freshly generated plan to the cache, best effort."""
+    try:
+        get_plan_cache().put(goal_norm, embedding, raw)
+    except Exception:
+        # a failed cache write should never break planning
+        pass
+
+
+def propose_todo_list(goal: str, settings: Settings) -> List[Task]:
+    """
+    Calls the LLM to propose a structured TODO list for the given goal.
+
+    Before paying for a completion, we consult prior sessions with the
+    exact same goal, then a local plan cache: an exact lookup on the
+    normalized goal, then a cosine-similarity match against embeddings of
+    earlier goals. Hits skip the LLM round-trip entirely.
+    """
+    if not goal.strip():
+        raise ValueError("Goal must not be empty")
+
+    prior = find_tasks_for_goal(goal)
+    if prior is not None:
+        return prior
+
+    goal_norm = normalize_goal(goal)
+    cached, embedding = _plan_from_cache(goal_norm, settings)
+    if cached is not None:
+        return _parse_tasks_from_json(cached)
+
     # Ask the model to strictly return JSON
     raw = chat_completion_json(
         settings,
-        messages,
-        response_format={"type": "json_object"},
+        _build_planner_messages(goal),
+        response_format=_PLANNER_RESPONSE_FORMAT,
     )
-    return _parse_tasks_from_json(raw)
+    tasks = _parse_tasks_from_json(raw)
+    _store_plan(goal_norm, embedding, raw)
+    return tasks
+
+
+async def propose_todo_list_stream(
+    goal: str,
+    settings: Settings,
+    on_task: Optional[Callable[[Task], None]] = None,
+) -> List[Task]:
+    """
+    Streaming variant of propose_todo_list.
+
+    The completion is requested with stream=True and fed through an
+    incremental JSON parser, so each task is handed to `on_task` as soon as
+    its closing brace arrives instead of after the whole response. The
+    accumulated text still goes through _parse_tasks_from_json at the end
+    as a sanity check, and prior sessions and the cache are consulted the
+    same way as in the synchronous path.
+    """
+    if not goal.strip():
+        raise ValueError("Goal must not be empty")
+
+    def _emit_all(tasks: List[Task]) -> List[Task]:
+        if on_task is not None:
+            for task in tasks:
+                on_task(task)
+        return tasks
+
+    # The cache lookups block: find_tasks_for_goal reads snapshot files,
+    # and _plan_from_cache makes a synchronous embeddings call on a miss.
+    # Run them in a worker thread so the event loop stays free.
+    prior = await anyio.to_thread.run_sync(find_tasks_for_goal, goal)
+    if prior is not None:
+        return _emit_all(prior)
+
+    goal_norm = normalize_goal(goal)
+    cached, embedding = await anyio.to_thread.run_sync(_plan_from_cache, goal_norm, settings)
+    if cached is not None:
+        return _emit_all(_parse_tasks_from_json(cached))
+
+    chunks: List[str] = []
+
+    async def _deltas():
+        stream = chat_completion_json_stream_async(
+            settings,
+            _build_planner_messages(goal),
+            response_format=_PLANNER_RESPONSE_FORMAT,
+        )
+        async for delta in stream:
+            chunks.append(delta)
+            yield delta
+
+    emitted = 0
+    async for value in jsonriver.parse(_deltas()):
+        raw_tasks = value.get("tasks") if isinstance(value, dict) else None
+        if not isinstance(raw_tasks, list):
+            continue
+        # Once the parser has started element i, every element before it is
+        # complete; the final element is only complete at end of stream.
+        while emitted < len(raw_tasks) - 1:
+            emitted += 1
+            if on_task is not None:
+                on_task(_task_from_raw(raw_tasks[emitted - 1], emitted))
+
+    raw = "".join(chunks)
+    tasks = _parse_tasks_from_json(raw)
+    if on_task is not None:
+        for task in tasks[emitted:]:
+            on_task(task)
+
+    # The cache write commits to SQLite; keep that off the loop too.
+    await anyio.to_thread.run_sync(_store_plan, goal_norm, embedding, raw)
+    return tasks
 
 
 def edit_tasks_interactively(state: SessionState) -> None:
@@ -1,18 +1,26 @@
 # todo_agent/storage.py
 from __future__ import annotations
 
-import json
+import hashlib
+import os
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
 from datetime import datetime
 
+import anyio
+import orjson
+
 from .config import Settings
 from .models import SessionState, Task, TaskStatus
 
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
+# After this many appended events the snapshot is rewritten and the
+# event log truncated, bounding replay cost on load.
+SNAPSHOT_EVERY = 20
+
 
 def _now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
@@ -22,28 +30,121 @@ def generate_session_id() -> str:
     return uuid4().hex
 
 
-def _session_path(session_id: str) -> Path:
+def _snapshot_path(session_id: str) -> Path:
+    return DATA_DIR / f"{session_id}.snapshot.json"
+
+
+def _events_path(session_id: str) -> Path:
+    return DATA_DIR / f"{session_id}.events.jsonl"
+
+
+def _legacy_path(session_id: str) -> Path:
+    # Pre-event-log sessions lived in a single {sid}.json file.
     return DATA_DIR / f"{session_id}.json"
 
 
-def save_session(state: SessionState, session_id: str) -> None:
+def _meta_path(session_id: str) -> Path:
+    return DATA_DIR / f"{session_id}.meta.json"
+
+
+def _goal_hash(goal: str) -> str:
+    return hashlib.blake2b(goal.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# goal hash -> most recent session_id with that exact goal, built lazily
+# from the meta sidecars and kept current by _write_meta.
+_goal_index: Optional[Dict[str, str]] = None
+
+
+def _build_goal_index() -> Dict[str, str]:
+    entries = []
+    for path in DATA_DIR.glob("*.meta.json"):
+        try:
+            meta = orjson.loads(path.read_bytes())
+        except Exception:
+            continue
+        goal = meta.get("goal") or ""
+        if goal:
+            entries.append(
+                (
+                    path.stat().st_mtime,
+                    _goal_hash(goal),
+                    meta.get("session_id", _session_id_from_path(path)),
+                )
+            )
+    # oldest first, so the most recent session wins for each goal
+    entries.sort()
+    return {goal_hash: session_id for _, goal_hash, session_id in entries}
+
+
+def find_tasks_for_goal(goal: str) -> Optional[List[Task]]:
     """
-    Persist the whole session to disk as JSON.
+    Exact-match planning shortcut: if an earlier session was created with
+    this exact goal, return a fresh copy of its tasks (statuses reset to
+    pending) so the planner needs no LLM or embedding call at all.
+    """
+    global _goal_index
+    if _goal_index is None:
+        _goal_index = _build_goal_index()
+
+    session_id = _goal_index.get(_goal_hash(goal))
+    if session_id is None:
+        return None
+
+    try:
+        payload = orjson.loads(_snapshot_path(session_id).read_bytes())
+    except Exception:
+        return None
 
-    JSON shape:
-    {
-      "session_id": "...",
-      "created_at": "...",
-      "updated_at": "...",
-      "state": { ... SessionState.to_dict() ... }
+    tasks_data = payload.get("state", {}).get("tasks", [])
+    if not tasks_data:
+        return None
+
+    return [
+        Task(
+            id=i,
+            title=str(raw.get("title", "")),
+            description=str(raw.get("description", "")),
+        )
+        for i, raw in enumerate(tasks_data, start=1)
+    ]
+
+
+def _write_meta(state: SessionState, session_id: str, created_at: str | None = None) -> None:
+    """
+    Write the tiny metadata sidecar that list_sessions reads, so listing
+    never has to parse full session files.
+    """
+    path = _meta_path(session_id)
+    if created_at is None:
+        try:
+            created_at = orjson.loads(path.read_bytes()).get("created_at")
+        except Exception:
+            created_at = None
+    meta = {
+        "session_id": session_id,
+        "goal": state.goal,
+        "mode": state.mode,
+        "created_at": created_at or _now_iso(),
+        "updated_at": _now_iso(),
+        "num_tasks": len(state.tasks),
     }
+    path.write_bytes(orjson.dumps(meta))
+
+    if _goal_index is not None and state.goal:
+        _goal_index[_goal_hash(state.goal)] = session_id
+
+
+def _write_snapshot(state: SessionState, session_id: str) -> None:
     """
-    path = _session_path(session_id)
+    Rewrite the full snapshot (fsynced) and truncate the event log.
+    """
+    path = _snapshot_path(session_id)
 
     created_at = _now_iso()
     if path.exists():
         try:
-            existing = json.loads(path.read_text(encoding="utf-8"))
+            existing = orjson.loads(path.read_bytes())
             created_at = existing.get("created_at", created_at)
         except Exception:
             # best effort; if file corrupted, we keep a fresh created_at
@@ -56,26 +157,109 @@ def save_session(state: SessionState, session_id: str) -> None:
         "state": state.to_dict(),
     }
 
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        f.flush()
+        os.fsync(f.fileno())
 
+    _events_path(session_id).write_bytes(b"")
+    _write_meta(state, session_id, created_at=created_at)
+    state.saved_descriptions = {t.id: t.description for t in state.tasks}
+    state.dirty_task_ids.clear()
+    state.logs_persisted = state.logs_total
+    state.events_since_snapshot = 0
 
-def load_session(session_id: str, settings: Settings) -> SessionState:
+
+def _append_event(state: SessionState, session_id: str) -> None:
     """
-    Load a SessionState from disk for a given session_id.
+    Append a single delta event (changed tasks + new log lines) to the
+    session's JSONL event log. One write, no fsync — durability comes from
+    the periodic snapshot.
     """
-    path = _session_path(session_id)
-    if not path.exists():
-        raise FileNotFoundError(f"Session {session_id} not found")
+    changed = []
+    for t in state.tasks:
+        if t.id not in state.dirty_task_ids:
+            continue
+        entry = t.to_dict()
+        # Descriptions are long and almost never change after planning;
+        # omit them when unchanged — replay keeps the existing value.
+        if state.saved_descriptions.get(t.id) == entry["description"]:
+            del entry["description"]
+        else:
+            state.saved_descriptions[t.id] = entry["description"]
+        changed.append(entry)
 
-    data = json.loads(path.read_text(encoding="utf-8"))
-    state_data = data.get("state", {})
+    event = {
+        "ts": _now_iso(),
+        "type": "task_update",
+        "tasks": changed,
+        "logs": state.unpersisted_logs(),
+    }
+
+    with open(_events_path(session_id), "ab") as f:
+        f.write(orjson.dumps(event) + b"\n")
+
+    _write_meta(state, session_id)
+    state.dirty_task_ids.clear()
+    state.logs_persisted = state.logs_total
+    state.events_since_snapshot += 1
+
+
+def save_session(state: SessionState, session_id: str, snapshot: bool = False) -> None:
+    """
+    Persist the session to disk.
+
+    Storage is a compact snapshot plus an append-only JSONL event log:
+    the first save (and every SNAPSHOT_EVERY saves thereafter) rewrites
+    the snapshot; the saves in between append only the delta since the
+    last save, so per-step write cost is O(changes) rather than
+    O(full state).
+    """
+    if (
+        snapshot
+        or not _snapshot_path(session_id).exists()
+        or state.events_since_snapshot >= SNAPSHOT_EVERY
+    ):
+        _write_snapshot(state, session_id)
+    else:
+        _append_event(state, session_id)
+
+
+async def save_session_async(state: SessionState, session_id: str, snapshot: bool = False) -> None:
+    """
+    Async variant of save_session for the web handlers: the disk writes
+    (including the snapshot fsync) run in a worker thread so they never
+    block the event loop. The CLI keeps the synchronous path.
+    """
+    await anyio.to_thread.run_sync(save_session, state, session_id, snapshot)
+
+
+def _apply_event(state: SessionState, event: Dict[str, Any]) -> None:
+    by_id = {t.id: t for t in state.tasks}
+    for raw in event.get("tasks", []):
+        task = by_id.get(raw.get("id"))
+        if task is None:
+            continue
+        task.title = str(raw.get("title", task.title))
+        task.description = str(raw.get("description", task.description))
+        task.result = raw.get("result", task.result)
+        task.reflection = raw.get("reflection", task.reflection)
+        try:
+            task.status = TaskStatus(str(raw.get("status", task.status.value)))
+        except ValueError:
+            pass
+    state.extend_logs(event.get("logs", []))
+
+
+def _state_from_payload(payload: Dict[str, Any], settings: Settings) -> SessionState:
+    state_data = payload.get("state", {})
     goal = state_data.get("goal", "")
     mode = state_data.get("mode", "confirm")
     tasks_data = state_data.get("tasks", [])
     logs = state_data.get("logs", [])
 
     state = SessionState(goal=goal, mode=mode, settings=settings)
-    state.logs = list(logs)
+    state.extend_logs(logs)
 
     tasks: List[Task] = []
     for raw in tasks_data:
@@ -100,30 +284,109 @@ def load_session(session_id: str, settings: Settings) -> SessionState:
     return state
 
 
+def load_session(session_id: str, settings: Settings) -> SessionState:
+    """
+    Load a SessionState from disk: read the snapshot, then replay any
+    events appended since it was written.
+    """
+    path = _snapshot_path(session_id)
+    if not path.exists():
+        # fall back to the pre-event-log single-file format
+        path = _legacy_path(session_id)
+        if not path.exists():
+            raise FileNotFoundError(f"Session {session_id} not found")
+        payload = orjson.loads(path.read_bytes())
+        state = _state_from_payload(payload, settings)
+        state.saved_descriptions = {t.id: t.description for t in state.tasks}
+        state.logs_persisted = state.logs_total
+        return state
+
+    payload = orjson.loads(path.read_bytes())
+    state = _state_from_payload(payload, settings)
+
+    events_path = _events_path(session_id)
+    if events_path.exists():
+        for line in events_path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            try:
+                _apply_event(state, orjson.loads(line))
+            except Exception:
+                # a torn trailing write is not fatal; ignore the bad line
+                continue
+            state.events_since_snapshot += 1
+
+    state.saved_descriptions = {t.id: t.description for t in state.tasks}
+    state.logs_persisted = state.logs_total
+    return state
+
+
+def _session_id_from_path(path: Path) -> str:
+    name = path.name
+    for suffix in (".meta.json", ".snapshot.json"):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return path.stem
+
+
+def _meta_from_full_file(path: Path) -> Dict[str, Any] | None:
+    """
+    Legacy fallback: derive metadata from a full session file (snapshot or
+    pre-event-log format) that predates the meta sidecars.
+    """
+    try:
+        data = orjson.loads(path.read_bytes())
+    except Exception:
+        return None
+
+    state_data = data.get("state", {})
+    return {
+        "session_id": data.get("session_id", _session_id_from_path(path)),
+        "goal": state_data.get("goal", ""),
+        "mode": state_data.get("mode", ""),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+        "num_tasks": len(state_data.get("tasks", [])),
+    }
+
+
 def list_sessions() -> List[Dict[str, Any]]:
     """
     Return lightweight metadata for all saved sessions.
+
+    Only the small {sid}.meta.json sidecars are read, so listing scales
+    with the number of sessions, not their size. Sessions saved before
+    the sidecars existed are parsed in full once and a meta file is
+    written for next time.
     """
-    sessions: List[Dict[str, Any]] = []
+    entries: List[tuple] = []
+    seen: set = set()
 
-    for path in DATA_DIR.glob("*.json"):
+    for path in DATA_DIR.glob("*.meta.json"):
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            meta = orjson.loads(path.read_bytes())
         except Exception:
             continue
+        entries.append((path.stat().st_mtime, meta))
+        seen.add(meta.get("session_id", _session_id_from_path(path)))
 
-        state_data = data.get("state", {})
-        sessions.append(
-            {
-                "session_id": data.get("session_id", path.stem),
-                "goal": state_data.get("goal", ""),
-                "mode": state_data.get("mode", ""),
-                "created_at": data.get("created_at"),
-                "updated_at": data.get("updated_at"),
-                "num_tasks": len(state_data.get("tasks", [])),
-            }
-        )
+    for path in DATA_DIR.glob("*.json"):
+        if path.name.endswith(".meta.json"):
+            continue
+        session_id = _session_id_from_path(path)
+        if session_id in seen:
+            continue
+        meta = _meta_from_full_file(path)
+        if meta is None:
+            continue
+        seen.add(session_id)
+        entries.append((path.stat().st_mtime, meta))
+        try:
+            _meta_path(session_id).write_bytes(orjson.dumps(meta))
+        except Exception:
+            # best effort; we can always fall back again next time
+            pass
 
-    # newest first
-    sessions.sort(key=lambda s: s.get("created_at") or "", reverse=True)
-    return sessions
+    # newest first, by file modification time
+    entries.sort(key=lambda e: e[0], reverse=True)
+    return [meta for _, meta in entries]
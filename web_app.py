@@ -1,6 +1,7 @@
 # web_app.py
 from __future__ import annotations
 
+import dataclasses
 from typing import Optional, Literal
 
 from fastapi import FastAPI, HTTPException, Request
@@ -8,14 +9,15 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
-from todo_agent.config import Settings
+from todo_agent.config import get_settings
 from todo_agent.models import SessionState
-from todo_agent.planner import propose_todo_list
-from todo_agent.executor import run_execution_step
+from todo_agent.planner import propose_todo_list_stream
+from todo_agent.executor import run_execution_step, run_execution_loop_async
 from todo_agent.storage import (
     generate_session_id,
-    save_session,
+    save_session_async,
     load_session,
     list_sessions,
 )
@@ -54,22 +56,29 @@ async def api_create_session(body: CreateSessionRequest):
     """
     Create a new session: plan TODO list and save initial state.
     """
-    settings = Settings()
+    if not body.goal.strip():
+        raise HTTPException(status_code=422, detail="Goal must not be empty")
+
+    settings = get_settings()
     if body.model:
-        settings.model = body.model
+        settings = dataclasses.replace(settings, model=body.model)
 
     state = SessionState(goal=body.goal, mode=body.mode, settings=settings)
     state.log("Session created.")
-    state.tasks = propose_todo_list(body.goal, settings)
+    state.tasks = await propose_todo_list_stream(
+        body.goal,
+        settings,
+        on_task=lambda task: state.log(f"[Planner] Task #{task.id} ready: {task.title}"),
+    )
     state.log(f"Planner created {len(state.tasks)} tasks.")
 
     session_id = generate_session_id()
-    save_session(state, session_id)
+    await save_session_async(state, session_id)
 
     return {
         "session_id": session_id,
         "state": state.to_dict(),
-        "has_pending": any(t.status.value == "pending" for t in state.tasks),
+        "has_pending": state.tasks.has_pending(),
     }
 
 
@@ -78,13 +87,13 @@ async def api_get_session(session_id: str):
     """
     Get full session state for a given session_id.
     """
-    settings = Settings()
+    settings = get_settings()
     try:
         state = load_session(session_id, settings)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    has_pending = any(t.status.value == "pending" for t in state.tasks)
+    has_pending = state.tasks.has_pending()
     return {
         "session_id": session_id,
         "state": state.to_dict(),
@@ -97,14 +106,16 @@ async def api_execute_step(session_id: str):
     """
     Execute a single pending task, if any. Returns updated state.
     """
-    settings = Settings()
+    settings = get_settings()
     try:
         state = load_session(session_id, settings)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    has_pending_after = run_execution_step(state)
-    save_session(state, session_id)
+    # run_execution_step blocks on a synchronous LLM call; run it in a
+    # worker thread so the event loop can serve other requests meanwhile.
+    has_pending_after = await run_in_threadpool(run_execution_step, state)
+    await save_session_async(state, session_id)
 
     return {
         "session_id": session_id,
@@ -118,16 +129,18 @@ async def api_execute_all(session_id: str):
     """
     Execute tasks until all are in a terminal state.
     """
-    settings = Settings()
+    settings = get_settings()
     try:
         state = load_session(session_id, settings)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    while run_execution_step(state):
-        pass
+    await run_execution_loop_async(state)
 
-    save_session(state, session_id)
+    # One save for the whole batch (per-step durability belongs to
+    # execute-step); force a snapshot so the event log is compacted now
+    # that the session is finished.
+    await save_session_async(state, session_id, snapshot=True)
 
     return {
         "session_id": session_id,